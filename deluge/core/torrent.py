@@ -15,10 +15,11 @@ Attributes:
 
 import logging
 import os
+import re
 import socket
 import time
+from operator import attrgetter
 from typing import Optional
-from urllib.parse import urlparse
 
 from twisted.internet.defer import Deferred, DeferredList
 
@@ -47,6 +48,26 @@ LT_TORRENT_STATE_MAP = {
     'checking_resume_data': 'Checking',
 }
 
+# The Deluge state indexed by libtorrent state value, from LT_TORRENT_STATE_MAP.
+LT_TORRENT_STATES = tuple(
+    LT_TORRENT_STATE_MAP.get(str(lt_state), str(lt_state))
+    for lt_state in (
+        lt.torrent_status.states.values.get(value, value)
+        for value in range(max(lt.torrent_status.states.values) + 1)
+    )
+)
+
+# Matches the hostname (or bracketed IPv6 address) of a tracker URL.
+RE_TRACKER_HOST = re.compile(
+    r'^[a-z][a-z0-9+.-]*://(?:[^@/]*@)?(?:\[([^\]]*)\]|([^:/?#]*))', re.IGNORECASE
+)
+# Second-level domains that are part of the tracker host, e.g. example.co.uk
+TRACKER_HOST_SLDS = frozenset(('co', 'com', 'net', 'org'))
+# Replaces non-alphabetic characters in GeoIP country codes with spaces.
+COUNTRY_CODE_TRANS = str.maketrans(
+    {chr(c): ' ' for c in range(256) if not chr(c).isalpha()}
+)
+
 
 def sanitize_filepath(filepath, folder=False):
     """Returns a sanitized filepath to pass to libtorrent rename_file().
@@ -58,19 +79,9 @@ def sanitize_filepath(filepath, folder=False):
         folder (bool): A trailing slash is appended to the returned filepath.
     """
 
-    def clean_filename(filename):
-        """Strips whitespace and discards dotted filenames"""
-        filename = filename.strip()
-        if filename.replace('.', '') == '':
-            return ''
-        return filename
-
-    if '\\' in filepath or '/' in filepath:
-        folderpath = filepath.replace('\\', '/').split('/')
-        folderpath = [clean_filename(x) for x in folderpath]
-        newfilepath = '/'.join([path for path in folderpath if path])
-    else:
-        newfilepath = clean_filename(filepath)
+    # Strip whitespace and discard empty or dotted filenames.
+    filenames = (path.strip() for path in filepath.replace('\\', '/').split('/'))
+    newfilepath = '/'.join(path for path in filenames if path.strip('.'))
 
     if folder is True:
         newfilepath += '/'
@@ -148,30 +159,38 @@ class TorrentOptions(dict):
         super_seeding (bool): Enable super seeding/initial seeding.
     """
 
+    # The options are only stored as dict items so avoid a per-instance __dict__.
+    __slots__ = ()
+
+    _options_conf_map = {
+        'add_paused': 'add_paused',
+        'auto_managed': 'auto_managed',
+        'download_location': 'download_location',
+        'max_connections': 'max_connections_per_torrent',
+        'max_download_speed': 'max_download_speed_per_torrent',
+        'max_upload_slots': 'max_upload_slots_per_torrent',
+        'max_upload_speed': 'max_upload_speed_per_torrent',
+        'move_completed': 'move_completed',
+        'move_completed_path': 'move_completed_path',
+        'pre_allocate_storage': 'pre_allocate_storage',
+        'prioritize_first_last_pieces': 'prioritize_first_last_pieces',
+        'remove_at_ratio': 'remove_seed_at_ratio',
+        'sequential_download': 'sequential_download',
+        'shared': 'shared',
+        'stop_at_ratio': 'stop_seed_at_ratio',
+        'stop_ratio': 'stop_seed_ratio',
+        'super_seeding': 'super_seeding',
+    }
+    # All the option keys, those without a core config default are set in __init__.
+    _option_keys = frozenset(_options_conf_map).union(
+        ('file_priorities', 'mapped_files', 'name', 'owner', 'seed_mode')
+    )
+
     def __init__(self):
-        super().__init__()
         config = ConfigManager('core.conf').config
-        options_conf_map = {
-            'add_paused': 'add_paused',
-            'auto_managed': 'auto_managed',
-            'download_location': 'download_location',
-            'max_connections': 'max_connections_per_torrent',
-            'max_download_speed': 'max_download_speed_per_torrent',
-            'max_upload_slots': 'max_upload_slots_per_torrent',
-            'max_upload_speed': 'max_upload_speed_per_torrent',
-            'move_completed': 'move_completed',
-            'move_completed_path': 'move_completed_path',
-            'pre_allocate_storage': 'pre_allocate_storage',
-            'prioritize_first_last_pieces': 'prioritize_first_last_pieces',
-            'remove_at_ratio': 'remove_seed_at_ratio',
-            'sequential_download': 'sequential_download',
-            'shared': 'shared',
-            'stop_at_ratio': 'stop_seed_at_ratio',
-            'stop_ratio': 'stop_seed_ratio',
-            'super_seeding': 'super_seeding',
-        }
-        for opt_k, conf_k in options_conf_map.items():
-            self[opt_k] = config[conf_k]
+        super().__init__(
+            {opt_k: config[conf_k] for opt_k, conf_k in self._options_conf_map.items()}
+        )
         self['file_priorities'] = []
         self['mapped_files'] = {}
         self['name'] = ''
@@ -224,13 +243,28 @@ class Torrent:
         forced_error (TorrentError): Keep track if we have forced this torrent to be in Error state.
     """
 
+    # The (key, func) pairs from status_funcs for recently requested keys.
+    _status_funcs_cache = {}
+
+    # The path type, bytes or str, accepted by each libtorrent handle path func.
+    _lt_path_types = {}
+
+    # Options with set funcs that have side effects even if the value is unchanged.
+    _always_set_options = frozenset(
+        ('auto_managed', 'file_priorities', 'prioritize_first_last_pieces')
+    )
+
     def __init__(self, handle, options, state=None, filename=None, magnet=None):
         self.torrent_id = str(handle.info_hash())
+        self._state_torrentfile = os.path.join(
+            get_config_dir(), 'state', self.torrent_id + '.torrent'
+        )
         if log.isEnabledFor(logging.DEBUG):
             log.debug('Creating torrent object %s', self.torrent_id)
 
         # Get the core config
         self.config = ConfigManager('core.conf')
+        self.core = component.get('Core')
         self.rpcserver = component.get('RPCServer')
 
         self.handle = handle
@@ -241,6 +275,12 @@ class Torrent:
 
         self.torrent_info = self.handle.torrent_file()
         self.has_metadata = self.status.has_metadata
+        # File sizes are cached for file progress as they never change.
+        self._file_sizes = None
+        # The files are cached until a file is renamed.
+        self._files = None
+        # The status values from the metadata, as they never change.
+        self._metadata_info = {}
 
         self.options = TorrentOptions()
         self.options.update(options)
@@ -266,12 +306,12 @@ class Torrent:
         self.tracker_host = None
         self.forcing_recheck = False
         self.forcing_recheck_paused = False
-        self.status_funcs = None
         self.prev_status = {}
         self.waiting_on_folder_rename = []
+        self._pieces_info = None
+        self._pieces_info_status = None
 
-        self._create_status_funcs()
-        self.set_options(self.options)
+        self._apply_options(self.options)
         self.update_state()
 
         if log.isEnabledFor(logging.DEBUG):
@@ -293,10 +333,18 @@ class Torrent:
         """Process the metadata received alert for this torrent"""
         self.has_metadata = True
         self.torrent_info = self.handle.get_torrent_info()
+        self._file_sizes = None
+        self._files = None
+        self._metadata_info = {}
+        self._pieces_info_status = None
         if self.options['prioritize_first_last_pieces']:
             self.set_prioritize_first_last_pieces(True)
         self.write_torrentfile()
 
+    def on_file_renamed(self):
+        """Process the file renamed alert for this torrent"""
+        self._files = None
+
     # --- Options methods ---
     def set_options(self, options):
         """Set the torrent options.
@@ -311,11 +359,27 @@ class Torrent:
                 'prioritize_first_last_pieces'
             )
 
+        # Only apply changed options to avoid redundant libtorrent calls.
+        self._apply_options(
+            {
+                key: value
+                for key, value in options.items()
+                if key in self._always_set_options
+                or (key in self.options and value != self.options[key])
+            }
+        )
+
+    def _apply_options(self, options):
+        """Apply the torrent options, calling the option set funcs if available.
+
+        Args:
+            options (dict): Torrent options, see TorrentOptions class for valid keys.
+        """
         for key, value in options.items():
             if key in self.options:
-                options_set_func = getattr(self, 'set_' + key, None)
+                options_set_func = self._options_set_funcs.get(key)
                 if options_set_func:
-                    options_set_func(value)
+                    options_set_func(self, value)
                 else:
                     # Update config options that do not have funcs
                     self.options[key] = value
@@ -407,11 +471,14 @@ class Torrent:
         # A list of priorities for each piece in the torrent
         priorities = self.handle.get_piece_priorities()
 
+        files = self.torrent_info.files()
+        map_file = self.torrent_info.map_file
+
         def get_file_piece(idx, byte_offset):
-            return self.torrent_info.map_file(idx, byte_offset, 0).piece
+            return map_file(idx, byte_offset, 0).piece
 
-        for idx in range(self.torrent_info.num_files()):
-            file_size = self.torrent_info.files().file_size(idx)
+        for idx in range(files.num_files()):
+            file_size = files.file_size(idx)
             two_percent_bytes = int(0.02 * file_size)
             # Get the pieces for the byte offsets
             first_start = get_file_piece(idx, 0)
@@ -578,11 +645,19 @@ class Torrent:
             trackers (list of dicts): A list of trackers.
         """
         if trackers is None:
-            self.trackers = list(self.handle.trackers())
+            self.trackers = self._get_handle_trackers()
             self.tracker_host = None
             return
 
-        if log.isEnabledFor(logging.DEBUG):
+        if [
+            {'url': tracker['url'], 'tier': tracker['tier']} for tracker in trackers
+        ] == self._get_handle_trackers():
+            # The trackers are unchanged so skip replacing and re-announcing.
+            self.trackers = trackers
+            return
+
+        log_debug = log.isEnabledFor(logging.DEBUG)
+        if log_debug:
             log.debug('Setting trackers for %s: %s', self.torrent_id, trackers)
 
         tracker_list = []
@@ -594,7 +669,7 @@ class Torrent:
         self.handle.replace_trackers(tracker_list)
 
         # Print out the trackers
-        if log.isEnabledFor(logging.DEBUG):
+        if log_debug:
             log.debug('Trackers set for %s:', self.torrent_id)
             for tracker in self.handle.trackers():
                 log.debug(' [tier %s]: %s', tracker['tier'], tracker['url'])
@@ -605,6 +680,17 @@ class Torrent:
             self.force_reannounce()
         self.tracker_host = None
 
+    def _get_handle_trackers(self):
+        """Get the trackers from the libtorrent handle.
+
+        Returns:
+            list of dict: The url and tier of each tracker.
+        """
+        return [
+            {'url': tracker['url'], 'tier': tracker['tier']}
+            for tracker in self.handle.trackers()
+        ]
+
     def set_tracker_status(self, status):
         """Sets the tracker status.
 
@@ -644,7 +730,7 @@ class Torrent:
     def update_state(self):
         """Updates the state, based on libtorrent's torrent state"""
         status = self.get_lt_status()
-        session_paused = component.get('Core').session.is_paused()
+        session_paused = self.core.session.is_paused()
         old_state = self.state
         self.set_status_message()
         status_error = status.errc.message() if status.errc.value() else ''
@@ -667,7 +753,11 @@ class Torrent:
         elif session_paused or status.paused:
             self.state = 'Paused'
         else:
-            self.state = LT_TORRENT_STATE_MAP.get(str(status.state), str(status.state))
+            lt_state = status.state
+            if lt_state < len(LT_TORRENT_STATES):
+                self.state = LT_TORRENT_STATES[lt_state]
+            else:
+                self.state = str(lt_state)
 
         if self.state != old_state:
             component.get('EventManager').emit(
@@ -746,21 +836,19 @@ class Torrent:
 
         """
         status = self.status
+        upload_rate = status.upload_payload_rate
+        download_rate = status.download_payload_rate
         eta = 0
-        if (
-            self.is_finished
-            and self.options['stop_at_ratio']
-            and status.upload_payload_rate
-        ):
+        if self.is_finished and self.options['stop_at_ratio'] and upload_rate:
             # We're a seed, so calculate the time to the 'stop_share_ratio'
             eta = (
                 int(status.all_time_download * self.options['stop_ratio'])
                 - status.all_time_upload
-            ) // status.upload_payload_rate
-        elif status.download_payload_rate:
+            ) // upload_rate
+        elif download_rate:
             left = status.total_wanted - status.total_wanted_done
             if left > 0:
-                eta = left // status.download_payload_rate
+                eta = left // download_rate
 
         # Limit to 1 year, avoid excessive values and prevent GTK int overflow.
         return eta if eta < 31557600 else -1
@@ -772,14 +860,16 @@ class Torrent:
             float: The ratio or -1.0 (for infinity).
 
         """
-        if self.status.total_done > 0:
-            return self.status.all_time_upload / self.status.total_done
-        else:
-            return -1.0
+        status = self.status
+        total_done = status.total_done
+        return status.all_time_upload / total_done if total_done > 0 else -1.0
 
     def get_files(self):
         """Get the files this torrent contains.
 
+        The files are cached until the metadata is received or a file is renamed,
+        so the returned list should not be modified.
+
         Returns:
             list of dict: The files.
 
@@ -787,8 +877,9 @@ class Torrent:
         if not self.has_metadata:
             return []
 
-        files = self.torrent_info.files()
-        return convert_lt_files(files)
+        if self._files is None:
+            self._files = convert_lt_files(self.torrent_info.files())
+        return self._files
 
     def get_orig_files(self):
         """Get the original filenames of files in this torrent.
@@ -825,6 +916,7 @@ class Torrent:
         """
         ret = []
         peers = self.handle.get_peer_info()
+        geoip_instance = self.core.geoip_instance
 
         for peer in peers:
             # We do not want to report peers that are half-connected
@@ -837,19 +929,10 @@ class Torrent:
                 # libtorrent on Py3 can raise UnicodeDecodeError for peer_info.client
                 client = 'unknown'
 
-            try:
-                country = component.get('Core').geoip_instance.country_code_by_addr(
-                    peer.ip[0]
-                )
-            except AttributeError:
-                country = ''
-            else:
-                try:
-                    country = ''.join(
-                        [char if char.isalpha() else ' ' for char in country]
-                    )
-                except TypeError:
-                    country = ''
+            country = ''
+            if geoip_instance:
+                country = geoip_instance.country_code_by_addr(peer.ip[0])
+                country = country.translate(COUNTRY_CODE_TRANS) if country else ''
 
             ret.append(
                 {
@@ -875,7 +958,7 @@ class Torrent:
 
     def get_file_priorities(self):
         """Return the file priorities"""
-        if not self.handle.status().has_metadata:
+        if not self.has_metadata:
             return []
 
         if not self.options['file_priorities']:
@@ -893,18 +976,19 @@ class Torrent:
         if not self.has_metadata:
             return []
 
-        try:
-            files_progresses = zip(
-                self.handle.file_progress(), self.torrent_info.files()
+        if self._file_sizes is None:
+            files = self.torrent_info.files()
+            self._file_sizes = tuple(
+                files.file_size(idx) for idx in range(files.num_files())
             )
+
+        try:
+            files_progresses = zip(self.handle.file_progress(), self._file_sizes)
         except Exception:
             # Handle libtorrent >=2.0.0,<=2.0.4 file_progress error
-            files_progresses = zip(iter(lambda: 0, 1), self.torrent_info.files())
+            files_progresses = zip(iter(lambda: 0, 1), self._file_sizes)
 
-        return [
-            progress / _file.size if _file.size else 0.0
-            for progress, _file in files_progresses
-        ]
+        return [progress / size if size else 0.0 for progress, size in files_progresses]
 
     def get_tracker_host(self):
         """Get the hostname of the currently connected tracker.
@@ -914,35 +998,31 @@ class Torrent:
         Returns:
             str: The tracker host
         """
-        if self.tracker_host:
+        if self.tracker_host is not None:
             return self.tracker_host
 
         tracker = self.status.current_tracker
         if not tracker and self.trackers:
             tracker = self.trackers[0]['url']
 
+        host = ''
         if tracker:
-            url = urlparse(tracker.replace('udp://', 'http://'))
-            if hasattr(url, 'hostname'):
-                host = url.hostname or 'DHT'
-                # Check if hostname is an IP address and just return it if that's the case
-                try:
-                    socket.inet_aton(host)
-                except OSError:
-                    pass
-                else:
-                    # This is an IP address because an exception wasn't raised
-                    return url.hostname
-
+            match = RE_TRACKER_HOST.match(tracker)
+            hostname = (match.group(1) or match.group(2)) if match else None
+            host = hostname.lower() if hostname else 'DHT'
+            # Check if hostname is an IP address and just return it if that's the case
+            try:
+                socket.inet_aton(host)
+            except OSError:
                 parts = host.split('.')
                 if len(parts) > 2:
-                    if parts[-2] in ('co', 'com', 'net', 'org') or parts[-1] == 'uk':
+                    if parts[-2] in TRACKER_HOST_SLDS or parts[-1] == 'uk':
                         host = '.'.join(parts[-3:])
                     else:
                         host = '.'.join(parts[-2:])
-                self.tracker_host = host
-                return host
-        return ''
+
+        self.tracker_host = host
+        return host
 
     def get_magnet_uri(self):
         """Returns a magnet URI for this torrent"""
@@ -967,7 +1047,7 @@ class Torrent:
             filename = decode_bytes(self.torrent_info.files().file_path(0))
             name = filename.replace('\\', '/', 1).split('/', 1)[0]
         else:
-            name = decode_bytes(self.handle.status().name)
+            name = decode_bytes(self.status.name)
 
         if not name:
             name = self.torrent_id
@@ -1029,33 +1109,77 @@ class Torrent:
             self.get_lt_status()
 
         if all_keys:
-            keys = list(self.status_funcs)
+            keys = self.status_funcs
 
-        status_dict = {}
-
-        for key in keys:
-            status_dict[key] = self.status_funcs[key]()
+        status_dict = self._build_status_dict(keys)
 
         if diff:
             session_id = self.rpcserver.get_session_id()
-            if session_id in self.prev_status:
-                # We have a previous status dict, so lets make a diff
-                status_diff = {}
-                for key, value in status_dict.items():
-                    if key in self.prev_status[session_id]:
-                        if value != self.prev_status[session_id][key]:
-                            status_diff[key] = value
-                    else:
-                        status_diff[key] = value
-
-                self.prev_status[session_id] = status_dict
-                return status_diff
+            if self.rpcserver.listen and not self.rpcserver.is_session_valid(
+                session_id
+            ):
+                # The session has disconnected so there is no one to diff for and
+                # storing would leave a stale prev_status until a client disconnects.
+                self.prev_status.pop(session_id, None)
+                return status_dict
 
+            prev_status = self.prev_status.get(session_id)
             self.prev_status[session_id] = status_dict
-            return status_dict
+            if prev_status is not None:
+                # Compare the whole dict first as it is often unchanged.
+                if status_dict == prev_status:
+                    return {}
+                # We have a previous status dict, so lets make a diff
+                return {
+                    key: value
+                    for key, value in status_dict.items()
+                    if key not in prev_status or value != prev_status[key]
+                }
 
         return status_dict
 
+    def _build_status_dict(self, keys):
+        """Build the status dict for the keys provided.
+
+        A stale libtorrent status is refreshed once here so the status funcs
+        can read the cached `_status` directly rather than each going through
+        the `status` property.
+
+        Args:
+            keys (list of str): the status keys
+
+        Returns:
+            dict: the status keys and their values
+        """
+        self._refresh_stale_status()
+        return {key: func(self) for key, func in self._get_status_funcs(keys)}
+
+    @classmethod
+    def _get_status_funcs(cls, keys):
+        """Get the status functions for the keys provided.
+
+        The resolved functions are cached per keys sequence, and shared by
+        all torrents, since clients request the same keys on every status poll.
+
+        Args:
+            keys (list of str): the status keys
+
+        Returns:
+            tuple: The (key, func) pairs in the same order as keys.
+        """
+        keys = tuple(keys)
+        try:
+            return cls._status_funcs_cache[keys]
+        except KeyError:
+            pass
+
+        status_funcs = tuple((key, cls.status_funcs[key]) for key in keys)
+        if len(cls._status_funcs_cache) >= 16:
+            # Avoid unbounded growth from clients with changing keys.
+            cls._status_funcs_cache.clear()
+        cls._status_funcs_cache[keys] = status_funcs
+        return status_funcs
+
     def get_lt_status(self) -> 'lt.torrent_status':
         """Get the torrent status fresh, not from cache.
 
@@ -1072,8 +1196,7 @@ class Torrent:
         If it has not been updated within the last five seconds, it will be
         automatically refreshed.
         """
-        if self._status_last_update < (time.time() - 5):
-            self.status = self.handle.status()
+        self._refresh_stale_status()
         return self._status
 
     @status.setter
@@ -1086,117 +1209,10 @@ class Torrent:
         self._status = status
         self._status_last_update = time.time()
 
-    def _create_status_funcs(self):
-        """Creates the functions for getting torrent status"""
-        self.status_funcs = {
-            'active_time': lambda: self.status.active_time,
-            'seeding_time': lambda: self.status.seeding_time,
-            'finished_time': lambda: self.status.finished_time,
-            'all_time_download': lambda: self.status.all_time_download,
-            'storage_mode': lambda: self.status.storage_mode.name.split('_')[
-                2
-            ],  # sparse or allocate
-            'distributed_copies': lambda: max(0.0, self.status.distributed_copies),
-            'download_payload_rate': lambda: self.status.download_payload_rate,
-            'file_priorities': self.get_file_priorities,
-            'hash': lambda: self.torrent_id,
-            'auto_managed': lambda: self.options['auto_managed'],
-            'is_auto_managed': lambda: self.options['auto_managed'],
-            'is_finished': lambda: self.is_finished,
-            'max_connections': lambda: self.options['max_connections'],
-            'max_download_speed': lambda: self.options['max_download_speed'],
-            'max_upload_slots': lambda: self.options['max_upload_slots'],
-            'max_upload_speed': lambda: self.options['max_upload_speed'],
-            'message': lambda: self.statusmsg,
-            'move_on_completed_path': lambda: self.options[
-                'move_completed_path'
-            ],  # Deprecated: move_completed_path
-            'move_on_completed': lambda: self.options[
-                'move_completed'
-            ],  # Deprecated: Use move_completed
-            'move_completed_path': lambda: self.options['move_completed_path'],
-            'move_completed': lambda: self.options['move_completed'],
-            'next_announce': lambda: self.status.next_announce.seconds,
-            'num_peers': lambda: self.status.num_peers - self.status.num_seeds,
-            'num_seeds': lambda: self.status.num_seeds,
-            'owner': lambda: self.options['owner'],
-            'paused': lambda: self.status.paused,
-            'prioritize_first_last': lambda: self.options[
-                'prioritize_first_last_pieces'
-            ],
-            # Deprecated: Use prioritize_first_last_pieces
-            'prioritize_first_last_pieces': lambda: self.options[
-                'prioritize_first_last_pieces'
-            ],
-            'sequential_download': lambda: self.options['sequential_download'],
-            'progress': self.get_progress,
-            'shared': lambda: self.options['shared'],
-            'remove_at_ratio': lambda: self.options['remove_at_ratio'],
-            'save_path': lambda: self.options[
-                'download_location'
-            ],  # Deprecated: Use download_location
-            'download_location': lambda: self.options['download_location'],
-            'seeds_peers_ratio': lambda: -1.0
-            if self.status.num_incomplete == 0
-            else (  # Use -1.0 to signify infinity
-                self.status.num_complete / self.status.num_incomplete
-            ),
-            'seed_rank': lambda: self.status.seed_rank,
-            'state': lambda: self.state,
-            'stop_at_ratio': lambda: self.options['stop_at_ratio'],
-            'stop_ratio': lambda: self.options['stop_ratio'],
-            'time_added': lambda: self.status.added_time,
-            'total_done': lambda: self.status.total_done,
-            'total_payload_download': lambda: self.status.total_payload_download,
-            'total_payload_upload': lambda: self.status.total_payload_upload,
-            'total_peers': lambda: self.status.num_incomplete,
-            'total_seeds': lambda: self.status.num_complete,
-            'total_uploaded': lambda: self.status.all_time_upload,
-            'total_wanted': lambda: self.status.total_wanted,
-            'total_remaining': lambda: self.status.total_wanted
-            - self.status.total_wanted_done,
-            'tracker': lambda: self.status.current_tracker,
-            'tracker_host': self.get_tracker_host,
-            'trackers': lambda: self.trackers,
-            'tracker_status': lambda: self.tracker_status,
-            'upload_payload_rate': lambda: self.status.upload_payload_rate,
-            'comment': lambda: decode_bytes(self.torrent_info.comment())
-            if self.has_metadata
-            else '',
-            'creator': lambda: decode_bytes(self.torrent_info.creator())
-            if self.has_metadata
-            else '',
-            'num_files': lambda: self.torrent_info.num_files()
-            if self.has_metadata
-            else 0,
-            'num_pieces': lambda: self.torrent_info.num_pieces()
-            if self.has_metadata
-            else 0,
-            'piece_length': lambda: self.torrent_info.piece_length()
-            if self.has_metadata
-            else 0,
-            'private': lambda: self.torrent_info.priv() if self.has_metadata else False,
-            'total_size': lambda: self.torrent_info.total_size()
-            if self.has_metadata
-            else 0,
-            'eta': self.get_eta,
-            'file_progress': self.get_file_progress,
-            'files': self.get_files,
-            'orig_files': self.get_orig_files,
-            'is_seed': lambda: self.status.is_seeding,
-            'peers': self.get_peers,
-            'queue': lambda: self.status.queue_position,
-            'ratio': self.get_ratio,
-            'completed_time': lambda: self.status.completed_time,
-            'last_seen_complete': lambda: self.status.last_seen_complete,
-            'name': self.get_name,
-            'pieces': self._get_pieces_info,
-            'seed_mode': lambda: self.status.seed_mode,
-            'super_seeding': lambda: self.status.super_seeding,
-            'time_since_download': lambda: self.status.time_since_download,
-            'time_since_upload': lambda: self.status.time_since_upload,
-            'time_since_transfer': self.get_time_since_transfer,
-        }
+    def _refresh_stale_status(self):
+        """Refresh the cached status if older than five seconds."""
+        if self._status_last_update < (time.time() - 5):
+            self.status = self.handle.status()
 
     def pause(self):
         """Pause this torrent.
@@ -1229,14 +1245,15 @@ class Torrent:
 
     def resume(self):
         """Resumes this torrent."""
-        if self.status.paused and self.status.auto_managed:
+        status = self.status
+        if status.paused and status.auto_managed:
             log.debug('Resume not possible for auto-managed torrent!')
         elif self.forced_error and self.forced_error.was_paused:
             log.debug(
                 'Resume skipped for forced_error torrent as it was originally paused.'
             )
         elif (
-            self.status.is_finished
+            status.is_finished
             and self.options['stop_at_ratio']
             and self.get_ratio() >= self.options['stop_ratio']
         ):
@@ -1302,12 +1319,8 @@ class Torrent:
                 return False
 
         try:
-            # lt needs utf8 byte-string. Otherwise if wstrings enabled, unicode string.
             # Keyword argument flags=2 (dont_replace) dont overwrite target files but delete source.
-            try:
-                self.handle.move_storage(dest.encode('utf8'), flags=2)
-            except TypeError:
-                self.handle.move_storage(dest, flags=2)
+            self._call_handle_path_func('move_storage', dest, flags=2)
         except RuntimeError as ex:
             log.error('Error calling libtorrent move_storage: %s', ex)
             return False
@@ -1354,7 +1367,7 @@ class Torrent:
             except OSError as ex:
                 log.error('Unable to save torrent file to: %s', ex)
 
-        filepath = os.path.join(get_config_dir(), 'state', self.torrent_id + '.torrent')
+        filepath = self._state_torrentfile
 
         if filedump is None:
             lt_ct = lt.create_torrent(self.torrent_info)
@@ -1371,9 +1384,7 @@ class Torrent:
 
     def delete_torrentfile(self, delete_copies=False):
         """Deletes the .torrent file in the state directory in config"""
-        torrent_files = [
-            os.path.join(get_config_dir(), 'state', self.torrent_id + '.torrent')
-        ]
+        torrent_files = [self._state_torrentfile]
         if delete_copies and self.filename:
             torrent_files.append(
                 os.path.join(self.config['torrentfiles_location'], self.filename)
@@ -1425,6 +1436,35 @@ class Torrent:
             self.forcing_recheck = False
         return self.forcing_recheck
 
+    def _call_handle_path_func(self, func_name, *args, **kwargs):
+        """Call a torrent handle func with a path in the type libtorrent accepts.
+
+        lt needs utf8 byte-string. Otherwise if wstrings enabled, unicode string.
+        The accepted type is detected on the first call of each func, so later
+        calls do not have to fail with a TypeError first.
+
+        Args:
+            func_name (str): The torrent handle func name.
+            *args: The func args, with the path (str) as the last arg.
+            **kwargs: The func keyword args.
+        """
+        func = getattr(self.handle, func_name)
+        *args, path = args
+        path_type = self._lt_path_types.get(func_name)
+        if path_type is None:
+            try:
+                func(*args, path.encode('utf8'), **kwargs)
+            except TypeError:
+                func(*args, path, **kwargs)
+                path_type = str
+            else:
+                path_type = bytes
+            self._lt_path_types[func_name] = path_type
+        elif path_type is bytes:
+            func(*args, path.encode('utf8'), **kwargs)
+        else:
+            func(*args, path, **kwargs)
+
     def rename_files(self, filenames):
         """Renames files in the torrent.
 
@@ -1434,11 +1474,7 @@ class Torrent:
         for index, filename in filenames:
             # Make sure filename is a sanitized unicode string.
             filename = sanitize_filepath(decode_bytes(filename))
-            # lt needs utf8 byte-string. Otherwise if wstrings enabled, unicode string.
-            try:
-                self.handle.rename_file(index, filename.encode('utf8'))
-            except (UnicodeDecodeError, TypeError):
-                self.handle.rename_file(index, filename)
+            self._call_handle_path_func('rename_file', index, filename)
 
     def rename_folder(self, folder, new_folder):
         """Renames a folder within a torrent.
@@ -1462,19 +1498,21 @@ class Torrent:
             """File rename complete"""
             wait_dict.pop(index, None)
 
+        folder_len = len(folder)
+        renames = [
+            (_file['index'], new_folder + _file['path'][folder_len:])
+            for _file in self.get_files()
+            if _file['path'].startswith(folder)
+        ]
+
+        # Keep track of filerenames we're waiting on
         wait_on_folder = {}
         self.waiting_on_folder_rename.append(wait_on_folder)
-        for _file in self.get_files():
-            if _file['path'].startswith(folder):
-                # Keep track of filerenames we're waiting on
-                wait_on_folder[_file['index']] = Deferred().addBoth(
-                    on_file_rename_complete, wait_on_folder, _file['index']
-                )
-                new_path = _file['path'].replace(folder, new_folder, 1)
-                try:
-                    self.handle.rename_file(_file['index'], new_path.encode('utf8'))
-                except (UnicodeDecodeError, TypeError):
-                    self.handle.rename_file(_file['index'], new_path)
+        for index, new_path in renames:
+            wait_on_folder[index] = Deferred().addBoth(
+                on_file_rename_complete, wait_on_folder, index
+            )
+            self._call_handle_path_func('rename_file', index, new_path)
 
         def on_folder_rename_complete(dummy_result, torrent, folder, new_folder):
             """Folder rename complete"""
@@ -1506,21 +1544,30 @@ class Torrent:
             os.path.join(download_location, folder.lstrip('\\/'))
         )
 
+        def remove_empty_subfolders(path):
+            """Remove empty subfolders bottom-up, returns True if path is now empty."""
+            with os.scandir(path) as it:
+                entries = list(it)
+
+            empty = True
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False) and remove_empty_subfolders(
+                    entry.path
+                ):
+                    try:
+                        os.rmdir(entry.path)
+                        log.debug('Removed Empty Folder %s', entry.path)
+                    except OSError as ex:
+                        log.debug(ex)
+                        empty = False
+                else:
+                    empty = False
+            return empty
+
         try:
-            if not os.listdir(folder_full_path):
+            if remove_empty_subfolders(folder_full_path):
                 os.removedirs(folder_full_path)
                 log.debug('Removed Empty Folder %s', folder_full_path)
-            else:
-                for root, dirs, dummy_files in os.walk(folder_full_path, topdown=False):
-                    for name in dirs:
-                        try:
-                            os.removedirs(os.path.join(root, name))
-                            log.debug(
-                                'Removed Empty Folder %s', os.path.join(root, name)
-                            )
-                        except OSError as ex:
-                            log.debug(ex)
-
         except OSError as ex:
             log.debug('Cannot Remove Folder: %s', ex)
 
@@ -1529,35 +1576,167 @@ class Torrent:
 
         If the key is no longer valid, the dict will be deleted.
         """
-        # Dict will be modified so iterate over generated list
-        for key in list(self.prev_status):
-            if not self.rpcserver.is_session_valid(key):
-                del self.prev_status[key]
+        invalid_keys = [
+            key for key in self.prev_status if not self.rpcserver.is_session_valid(key)
+        ]
+        for key in invalid_keys:
+            del self.prev_status[key]
 
     def _get_pieces_info(self):
-        """Get the pieces for this torrent."""
-        if not self.has_metadata or self.status.is_seeding:
+        """Get the pieces for this torrent.
+
+        The pieces are cached until the torrent status is next updated.
+        """
+        status = self.status
+        if status is self._pieces_info_status:
+            return self._pieces_info
+
+        if not self.has_metadata or status.is_seeding:
             pieces = None
         else:
-            pieces = []
-            for piece, avail_piece in zip(
-                self.status.pieces, self.handle.piece_availability()
-            ):
-                if piece:
-                    pieces.append(3)  # Completed.
-                elif avail_piece:
-                    pieces.append(
-                        1
-                    )  # Available, just not downloaded nor being downloaded.
-                else:
-                    pieces.append(
-                        0
-                    )  # Missing, no known peer with piece, or not asked for yet.
+            # Completed (3), available from peers but not downloaded (1), or
+            # missing with no known peer having the piece (0).
+            pieces = [
+                3 if piece else 1 if avail_piece else 0
+                for piece, avail_piece in zip(
+                    status.pieces, self.handle.piece_availability()
+                )
+            ]
 
-            for peer_info in self.handle.get_peer_info():
-                if peer_info.downloading_piece_index >= 0:
-                    pieces[
-                        peer_info.downloading_piece_index
-                    ] = 2  # Being downloaded from peer.
+            for piece_index in map(
+                attrgetter('downloading_piece_index'), self.handle.get_peer_info()
+            ):
+                if piece_index >= 0:
+                    pieces[piece_index] = 2  # Being downloaded from peer.
 
+        self._pieces_info_status = status
+        self._pieces_info = pieces
         return pieces
+
+
+# Maps the option keys to their Torrent set funcs, e.g. 'owner' to set_owner.
+Torrent._options_set_funcs = {
+    name[len('set_') :]: func
+    for name, func in vars(Torrent).items()
+    if name.startswith('set_') and name[len('set_') :] in TorrentOptions._option_keys
+}
+
+
+def _option_getter(key):
+    """Returns a status func for the torrent option key."""
+    return lambda torrent: torrent.options[key]
+
+
+def _metadata_getter(key, func, default):
+    """Returns a status func calling func with the torrent_info if there is metadata.
+
+    The value is cached for the torrent as the metadata does not change.
+    """
+
+    def getter(torrent):
+        if not torrent.has_metadata:
+            return default
+        try:
+            return torrent._metadata_info[key]
+        except KeyError:
+            value = torrent._metadata_info[key] = func(torrent.torrent_info)
+            return value
+
+    return getter
+
+
+# The functions to get the torrent status, each is called with the Torrent.
+# The status funcs read `_status` as `_build_status_dict` refreshes it if stale.
+Torrent.status_funcs = {
+    'active_time': attrgetter('_status.active_time'),
+    'seeding_time': attrgetter('_status.seeding_time'),
+    'finished_time': attrgetter('_status.finished_time'),
+    'all_time_download': attrgetter('_status.all_time_download'),
+    # sparse or allocate
+    'storage_mode': lambda torrent: torrent._status.storage_mode.name.split('_')[2],
+    'distributed_copies': lambda torrent: max(0.0, torrent._status.distributed_copies),
+    'download_payload_rate': attrgetter('_status.download_payload_rate'),
+    'file_priorities': Torrent.get_file_priorities,
+    'hash': attrgetter('torrent_id'),
+    'auto_managed': _option_getter('auto_managed'),
+    'is_auto_managed': _option_getter('auto_managed'),
+    'is_finished': attrgetter('is_finished'),
+    'max_connections': _option_getter('max_connections'),
+    'max_download_speed': _option_getter('max_download_speed'),
+    'max_upload_slots': _option_getter('max_upload_slots'),
+    'max_upload_speed': _option_getter('max_upload_speed'),
+    'message': attrgetter('statusmsg'),
+    # Deprecated: move_completed_path
+    'move_on_completed_path': _option_getter('move_completed_path'),
+    # Deprecated: Use move_completed
+    'move_on_completed': _option_getter('move_completed'),
+    'move_completed_path': _option_getter('move_completed_path'),
+    'move_completed': _option_getter('move_completed'),
+    'next_announce': attrgetter('_status.next_announce.seconds'),
+    'num_peers': lambda torrent: torrent._status.num_peers - torrent._status.num_seeds,
+    'num_seeds': attrgetter('_status.num_seeds'),
+    'owner': _option_getter('owner'),
+    'paused': attrgetter('_status.paused'),
+    'prioritize_first_last': _option_getter('prioritize_first_last_pieces'),
+    # Deprecated: Use prioritize_first_last_pieces
+    'prioritize_first_last_pieces': _option_getter('prioritize_first_last_pieces'),
+    'sequential_download': _option_getter('sequential_download'),
+    'progress': Torrent.get_progress,
+    'shared': _option_getter('shared'),
+    'remove_at_ratio': _option_getter('remove_at_ratio'),
+    # Deprecated: Use download_location
+    'save_path': _option_getter('download_location'),
+    'download_location': _option_getter('download_location'),
+    'seeds_peers_ratio': lambda torrent: -1.0
+    if torrent._status.num_incomplete == 0
+    else (  # Use -1.0 to signify infinity
+        torrent._status.num_complete / torrent._status.num_incomplete
+    ),
+    'seed_rank': attrgetter('_status.seed_rank'),
+    'state': attrgetter('state'),
+    'stop_at_ratio': _option_getter('stop_at_ratio'),
+    'stop_ratio': _option_getter('stop_ratio'),
+    'time_added': attrgetter('_status.added_time'),
+    'total_done': attrgetter('_status.total_done'),
+    'total_payload_download': attrgetter('_status.total_payload_download'),
+    'total_payload_upload': attrgetter('_status.total_payload_upload'),
+    'total_peers': attrgetter('_status.num_incomplete'),
+    'total_seeds': attrgetter('_status.num_complete'),
+    'total_uploaded': attrgetter('_status.all_time_upload'),
+    'total_wanted': attrgetter('_status.total_wanted'),
+    'total_remaining': lambda torrent: torrent._status.total_wanted
+    - torrent._status.total_wanted_done,
+    'tracker': attrgetter('_status.current_tracker'),
+    'tracker_host': Torrent.get_tracker_host,
+    'trackers': attrgetter('trackers'),
+    'tracker_status': attrgetter('tracker_status'),
+    'upload_payload_rate': attrgetter('_status.upload_payload_rate'),
+    'comment': _metadata_getter(
+        'comment', lambda info: decode_bytes(info.comment()), ''
+    ),
+    'creator': _metadata_getter(
+        'creator', lambda info: decode_bytes(info.creator()), ''
+    ),
+    'num_files': _metadata_getter('num_files', lt.torrent_info.num_files, 0),
+    'num_pieces': _metadata_getter('num_pieces', lt.torrent_info.num_pieces, 0),
+    'piece_length': _metadata_getter('piece_length', lt.torrent_info.piece_length, 0),
+    'private': _metadata_getter('private', lt.torrent_info.priv, False),
+    'total_size': _metadata_getter('total_size', lt.torrent_info.total_size, 0),
+    'eta': Torrent.get_eta,
+    'file_progress': Torrent.get_file_progress,
+    'files': Torrent.get_files,
+    'orig_files': Torrent.get_orig_files,
+    'is_seed': attrgetter('_status.is_seeding'),
+    'peers': Torrent.get_peers,
+    'queue': attrgetter('_status.queue_position'),
+    'ratio': Torrent.get_ratio,
+    'completed_time': attrgetter('_status.completed_time'),
+    'last_seen_complete': attrgetter('_status.last_seen_complete'),
+    'name': Torrent.get_name,
+    'pieces': Torrent._get_pieces_info,
+    'seed_mode': attrgetter('_status.seed_mode'),
+    'super_seeding': attrgetter('_status.super_seeding'),
+    'time_since_download': attrgetter('_status.time_since_download'),
+    'time_since_upload': attrgetter('_status.time_since_upload'),
+    'time_since_transfer': Torrent.get_time_since_transfer,
+}
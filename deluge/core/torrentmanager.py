@@ -229,7 +229,6 @@ class TorrentManager(component.Component):
         # Define timers
         self.save_state_timer = LoopingCall(self.save_state)
         self.save_resume_data_timer = LoopingCall(self.save_resume_data)
-        self.prev_status_cleanup_loop = LoopingCall(self.cleanup_torrents_prev_status)
 
     def start(self):
         # Check for old temp file to verify safe shutdown
@@ -246,7 +245,11 @@ class TorrentManager(component.Component):
         # Save the state periodically
         self.save_state_timer.start(200, False)
         self.save_resume_data_timer.start(190, False)
-        self.prev_status_cleanup_loop.start(10)
+
+        # Clean up the prev_status of sessions only when a client disconnects
+        component.get('EventManager').register_event_handler(
+            'ClientDisconnectedEvent', self._on_client_disconnected_event
+        )
 
     @maybe_coroutine
     async def stop(self):
@@ -257,8 +260,9 @@ class TorrentManager(component.Component):
         if self.save_resume_data_timer.running:
             self.save_resume_data_timer.stop()
 
-        if self.prev_status_cleanup_loop.running:
-            self.prev_status_cleanup_loop.stop()
+        component.get('EventManager').deregister_event_handler(
+            'ClientDisconnectedEvent', self._on_client_disconnected_event
+        )
 
         # Save state on shutdown
         await self.save_state()
@@ -1215,6 +1219,14 @@ class TorrentManager(component.Component):
         for torrent in self.torrents.values():
             torrent.cleanup_prev_status()
 
+    def _on_client_disconnected_event(self, dummy_session_id):
+        """Cleanup the torrents prev_status when a client disconnects.
+
+        The event session_id is the last session to make an RPC call rather
+        than necessarily the disconnected one, so all sessions are checked.
+        """
+        self.cleanup_torrents_prev_status()
+
     def on_set_max_connections_per_torrent(self, key, value):
         """Sets the per-torrent connection limit"""
         log.debug('max_connections_per_torrent set to %s...', value)
@@ -1530,6 +1542,7 @@ class TorrentManager(component.Component):
 
         new_name = decode_bytes(alert.new_name())
         log.debug('index: %s name: %s', alert.index, new_name)
+        torrent.on_file_renamed()
 
         # We need to see if this file index is in a waiting_on_folder dict
         for wait_on_folder in torrent.waiting_on_folder_rename:
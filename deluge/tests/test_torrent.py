@@ -5,6 +5,7 @@
 #
 import itertools
 import os
+import pickle
 import time
 from base64 import b64encode
 from unittest import mock
@@ -22,7 +23,7 @@ from deluge.common import VersionSplit, utf8_encode_structure
 from deluge.conftest import BaseTestCase
 from deluge.core.core import Core
 from deluge.core.rpcserver import RPCServer
-from deluge.core.torrent import Torrent
+from deluge.core.torrent import Torrent, TorrentOptions
 from deluge.core.torrentmanager import TorrentManager, TorrentState
 
 
@@ -373,3 +374,218 @@ class TestTorrent(BaseTestCase):
             # Advance time and verify cache expires and updates
             mock_time.return_value += 10
             assert torrent.status == 2
+
+    def test_get_status_diff(self):
+        atp = self.get_torrent_atp('test_torrent.file.torrent')
+        handle = self.session.add_torrent(atp)
+        torrent = Torrent(handle, {})
+        keys = ['name', 'trackers', 'max_connections']
+
+        status = torrent.get_status(keys, diff=True)
+        assert sorted(status) == sorted(keys)
+        assert torrent.get_status(keys, diff=True) == {}
+
+        torrent.set_max_connections(20)
+        assert torrent.get_status(keys, diff=True) == {'max_connections': 20}
+        assert torrent.get_status(keys) == dict(status, max_connections=20)
+
+    def test_get_status_diff_invalid_session(self):
+        atp = self.get_torrent_atp('test_torrent.file.torrent')
+        handle = self.session.add_torrent(atp)
+        torrent = Torrent(handle, {})
+        keys = ['name', 'max_connections']
+        with mock.patch.object(self.rpcserver, 'listen', True):
+            assert sorted(torrent.get_status(keys, diff=True)) == sorted(keys)
+            assert torrent.prev_status == {}
+            assert sorted(torrent.get_status(keys, diff=True)) == sorted(keys)
+
+    def test_torrent_options_defaults(self):
+        options = TorrentOptions()
+        assert options['max_connections'] == -1
+        assert options['file_priorities'] == []
+        assert options['file_priorities'] is not TorrentOptions()['file_priorities']
+
+        self.core.config['max_connections_per_torrent'] = 50
+        assert TorrentOptions()['max_connections'] == 50
+        assert options['max_connections'] == -1
+
+    def test_options_set_funcs(self):
+        assert TorrentOptions._option_keys == set(TorrentOptions())
+        assert set(Torrent._options_set_funcs) <= TorrentOptions._option_keys
+        assert Torrent._options_set_funcs['owner'] is Torrent.set_owner
+        for key in ('options', 'trackers', 'tracker_status', 'save_path'):
+            assert key not in Torrent._options_set_funcs
+
+    def test_get_tracker_host(self):
+        atp = self.get_torrent_atp('test_torrent.file.torrent')
+        handle = self.session.add_torrent(atp)
+        torrent = Torrent(handle, {})
+        torrent.status = mock.MagicMock()
+        for tracker, host in (
+            ('udp://tracker.Example.com:80/announce', 'example.com'),
+            ('http://user@a.tracker.example.co.uk/announce', 'example.co.uk'),
+            ('https://[2001:db8::1]:443/announce', '2001:db8::1'),
+            ('http://192.168.1.1:6969/announce', '192.168.1.1'),
+            ('http:///announce', 'DHT'),
+            ('', ''),
+        ):
+            torrent.status.current_tracker = tracker
+            torrent.set_tracker_status('')
+            assert torrent.get_tracker_host() == host
+
+    def test_set_options_unchanged(self):
+        atp = self.get_torrent_atp('test_torrent.file.torrent')
+        handle = self.session.add_torrent(atp)
+        torrent = Torrent(handle, {'max_upload_speed': 10})
+        set_speed = mock.Mock()
+        with mock.patch.dict(
+            Torrent._options_set_funcs, {'max_upload_speed': set_speed}
+        ):
+            torrent.set_options({'max_upload_speed': 10})
+            set_speed.assert_not_called()
+            torrent.set_options({'max_upload_speed': 20})
+            set_speed.assert_called_once_with(torrent, 20)
+
+    def test_get_file_progress(self):
+        atp = self.get_torrent_atp('dir_with_6_files.torrent')
+        handle = self.session.add_torrent(atp)
+        torrent = Torrent(handle, {})
+        num_files = torrent.torrent_info.num_files()
+        assert torrent.get_file_progress() == [0.0] * num_files
+
+        file_sizes = [f['size'] for f in torrent.get_files()]
+        with mock.patch.object(
+            handle, 'file_progress', return_value=[size // 2 for size in file_sizes]
+        ):
+            progress = torrent.get_file_progress()
+        assert progress == [(size // 2) / size for size in file_sizes]
+
+    def test_set_trackers_unchanged(self):
+        atp = self.get_torrent_atp('test_torrent.file.torrent')
+        handle = self.session.add_torrent(atp)
+        torrent = Torrent(handle, {})
+        trackers = [{'url': 'http://tracker.example.com/announce', 'tier': 0}]
+        with mock.patch.object(torrent, 'force_reannounce') as force_reannounce:
+            torrent.set_trackers(trackers)
+            torrent.set_trackers(list(trackers))
+            force_reannounce.assert_called_once_with()
+        assert torrent.trackers == trackers
+        assert [t['url'] for t in handle.trackers()] == [trackers[0]['url']]
+
+    def test_torrent_options_pickle(self):
+        options = TorrentOptions()
+        options['name'] = 'test'
+        assert not hasattr(options, '__dict__')
+        unpickled = pickle.loads(pickle.dumps(options, protocol=2))
+        assert isinstance(unpickled, TorrentOptions)
+        assert unpickled == options
+
+    def test_get_status_all_keys(self):
+        atp = self.get_torrent_atp('dir_with_6_files.torrent')
+        handle = self.session.add_torrent(atp)
+        torrent = Torrent(handle, {'max_connections': 20})
+        status = torrent.get_status([], all_keys=True)
+        assert sorted(status) == sorted(Torrent.status_funcs)
+        assert status['hash'] == torrent.torrent_id
+        assert status['max_connections'] == 20
+        assert status['num_files'] == torrent.torrent_info.num_files()
+        assert status['total_remaining'] == (
+            torrent.status.total_wanted - torrent.status.total_wanted_done
+        )
+        assert status['name'] == torrent.get_name()
+
+    def test_get_pieces_info_cache(self):
+        atp = self.get_torrent_atp('dir_with_6_files.torrent')
+        handle = self.session.add_torrent(atp)
+        torrent = Torrent(handle, {})
+        num_pieces = torrent.torrent_info.num_pieces()
+        with mock.patch.object(
+            handle, 'piece_availability', return_value=[1] * num_pieces
+        ) as piece_availability:
+            pieces = torrent.get_status(['pieces'])['pieces']
+            assert pieces == [1] * num_pieces
+            assert torrent.get_status(['pieces'])['pieces'] is pieces
+            assert piece_availability.call_count == 1
+
+            torrent.get_lt_status()
+            assert torrent.get_status(['pieces'])['pieces'] == pieces
+            assert piece_availability.call_count == 2
+
+    def test_get_status_mutated_keys(self):
+        atp = self.get_torrent_atp('test_torrent.file.torrent')
+        handle = self.session.add_torrent(atp)
+        torrent = Torrent(handle, {})
+        keys = ['name']
+        assert torrent.get_status(keys) == {'name': torrent.get_name()}
+        keys.append('state')
+        assert torrent.get_status(keys) == {
+            'name': torrent.get_name(),
+            'state': torrent.state,
+        }
+
+    def test_remove_empty_folders(self):
+        atp = self.get_torrent_atp('test_torrent.file.torrent')
+        handle = self.session.add_torrent(atp)
+        torrent = Torrent(handle, {'download_location': str(self.config_dir)})
+        folder = self.config_dir / 'folder'
+        (folder / 'empty' / 'nested').mkdir(parents=True)
+        (folder / 'full').mkdir()
+        (folder / 'full' / 'file').write_text('data')
+
+        torrent.remove_empty_folders('/folder')
+        assert sorted(os.listdir(folder)) == ['full']
+
+        os.remove(folder / 'full' / 'file')
+        torrent.remove_empty_folders('folder')
+        assert not folder.exists()
+        assert self.config_dir.exists()
+
+    def test_call_handle_path_func(self):
+        atp = self.get_torrent_atp('test_torrent.file.torrent')
+        handle = self.session.add_torrent(atp)
+        torrent = Torrent(handle, {})
+        dest = str(self.config_dir / 'moved')
+        with mock.patch.dict(Torrent._lt_path_types, clear=True):
+            assert torrent.move_storage(dest)
+            path_type = Torrent._lt_path_types['move_storage']
+            with mock.patch.object(handle, 'move_storage') as move_storage:
+                assert torrent.move_storage(dest)
+                move_storage.assert_called_once_with(
+                    dest.encode('utf8') if path_type is bytes else dest, flags=2
+                )
+
+    def test_get_files_cache(self):
+        atp = self.get_torrent_atp('dir_with_6_files.torrent')
+        handle = self.session.add_torrent(atp)
+        torrent = Torrent(handle, {})
+        files = torrent.get_files()
+        assert len(files) == torrent.torrent_info.num_files()
+        assert torrent.get_files() is files
+
+        torrent.on_file_renamed()
+        assert torrent.get_files() is not files
+        assert torrent.get_files() == files
+
+    def test_get_status_metadata_cache(self):
+        atp = self.get_torrent_atp('test_torrent.file.torrent')
+        handle = self.session.add_torrent(atp)
+        torrent = Torrent(handle, {})
+        keys = ['comment', 'num_pieces', 'total_size']
+        status = torrent.get_status(keys)
+        assert status['num_pieces'] == torrent.torrent_info.num_pieces()
+
+        with mock.patch.object(torrent, 'torrent_info') as torrent_info:
+            assert torrent.get_status(keys) == status
+            assert not torrent_info.method_calls
+
+    def test_get_pieces_info_metadata_received(self):
+        atp = self.get_torrent_atp('dir_with_6_files.torrent')
+        handle = self.session.add_torrent(atp)
+        torrent = Torrent(handle, {})
+        torrent.has_metadata = False
+        assert torrent.get_status(['pieces'])['pieces'] is None
+
+        with mock.patch.object(torrent, 'write_torrentfile'):
+            torrent.on_metadata_received()
+        pieces = torrent.get_status(['pieces'])['pieces']
+        assert len(pieces) == torrent.torrent_info.num_pieces()
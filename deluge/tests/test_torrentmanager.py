@@ -20,6 +20,7 @@ from deluge.conftest import BaseTestCase
 from deluge.core.core import Core
 from deluge.core.rpcserver import RPCServer
 from deluge.error import InvalidTorrentError
+from deluge.event import ClientDisconnectedEvent
 
 from . import common
 
@@ -144,3 +145,17 @@ class TestTorrentmanager(BaseTestCase):
 
         state = self.tm.open_state()
         assert len(state.torrents) == 1
+
+    @pytest_twisted.inlineCallbacks
+    def test_client_disconnected_cleanup_prev_status(self):
+        filename = common.get_test_data_file('test.torrent')
+        with open(filename, 'rb') as _file:
+            filedump = _file.read()
+        torrent_id = yield self.core.add_torrent_file_async(
+            filename, b64encode(filedump), {}
+        )
+        torrent = self.tm[torrent_id]
+        torrent.prev_status[1] = {}
+
+        component.get('EventManager').emit(ClientDisconnectedEvent(1))
+        assert not torrent.prev_status